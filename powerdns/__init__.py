@@ -23,8 +23,9 @@ powerdns - PowerDNS API client and interface
 
 import logging
 from logging.handlers import SysLogHandler
-from .client import PDNSApiClient
+from .client import PDNSApiClient, PDNSAsyncApiClient
 from .interface import PDNSEndpoint
+from .models import Comment, Record, RRSet
 
 
 __version__ = "2.3.0"
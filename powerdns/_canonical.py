@@ -0,0 +1,26 @@
+"""
+powerdns._canonical - DNS names canonicalization helpers
+
+This module is kept free of pydantic so that it can be compiled with mypyc,
+see the opt-in mypyc build hook in pyproject.toml.
+"""
+
+from functools import lru_cache
+
+
+@lru_cache(maxsize=8192)
+def canonicalize(name: str, zone: str) -> str:
+    """
+    Get the canonical form of a name in a zone.
+
+    Results are memoized process-wide, so that RRSets of the same zone share
+    their canonical strings instead of building new ones.
+    """
+    return name if name[-1:] == '.' else f"{name}.{zone}"
+
+
+def clear_canonicalize_cache() -> None:
+    """
+    Clear the memoized canonical names, e.g. in long-running processes.
+    """
+    canonicalize.cache_clear()
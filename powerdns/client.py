@@ -1,15 +1,64 @@
 import json
 import logging
 import requests
+from abc import ABC, abstractmethod
+from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
 from .exceptions import PDNSError
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
 logger = logging.getLogger(__name__)
 
+_BODYLESS_METHODS = frozenset(('GET', 'HEAD', 'DELETE'))
+_EMPTY_BODY = b'{}'
+_JSON_HEADERS = {'Content-Type': 'application/json'}
 
-class PDNSApiClient:
-    """Powerdns API client
 
-    It implements common HTTP methods GET, POST, PUT, PATCH and DELETE
+def _json_default(obj):
+    """Serialize objects not natively supported by the JSON encoders
+
+    Pydantic models (such as :class:`~powerdns.models.RRSet`) are dumped
+    using their aliases, as expected by the PowerDNS API.
+    """
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(by_alias=True)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_dumps(data):
+    """Serialize data to JSON, as UTF-8 encoded bytes
+
+    orjson is used when available, stdlib :mod:`json` otherwise.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=_json_default)
+    return json.dumps(data, default=_json_default).encode('utf-8')
+
+
+def json_loads(data):
+    """Deserialize JSON from bytes or str
+
+    orjson is used when available, stdlib :mod:`json` otherwise.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class PDNSApiClientBase(ABC):
+    """Base class for Powerdns API clients
+
+    It holds the API configuration and handles URLs, request data encoding
+    and responses, independently of the HTTP transport.
 
     :param str api_endpoint: Powerdns API endpoint
     :param str api_key: API key
@@ -18,82 +67,92 @@ class PDNSApiClient:
     """
     def __init__(self, api_endpoint, api_key, verify=True, timeout=None):
         self._api_endpoint = api_endpoint
+        self._base_url = api_endpoint.rstrip('/') + '/'
         self._api_key = api_key
         self._verify = verify
         self._timeout = timeout
+        self._repr = None
 
         if not verify:
             logger.debug("removing insecure https connection warnings")
             requests.urllib3.disable_warnings(requests.urllib3.exceptions.InsecureRequestWarning)
 
-        self.request_headers = {
-            'Content-Type': 'application/json',
-            'Accept': 'application/json'
-        }
+        self.request_headers = {'Accept': 'application/json'}
+        if api_key:
+            self.request_headers['X-API-Key'] = api_key
 
     def __repr__(self):
-        return (f"PDNSApiClient({repr(self._api_endpoint)}, {repr(self._api_key)}, verify={repr(self._verify)}, "
-                f"timeout={repr(self._timeout)})")
+        if self._repr is None:
+            self._repr = (f"{type(self).__name__}({repr(self._api_endpoint)}, {repr(self._api_key)}, "
+                          f"verify={repr(self._verify)}, timeout={repr(self._timeout)})")
+        return self._repr
 
     def __str__(self):
         return self._api_endpoint
 
-    def request(self, path, method, data=None, **kwargs):
-        """Handle requests to API
+    def _prepare_request(self, path, method, data):
+        """Build request URL, encoded data and headers
+
+        GET, HEAD and DELETE requests without data are sent without a body.
+        Other requests without data are sent an empty JSON object.
 
         :param str path: API endpoint's path to request
         :param str method: HTTP method to use
-        :param dict data: Data to send (optional)
-        :return: Parsed json response as :class:`dict`
-
-        Additional named argument may be passed and are directly transmitted
-        to :meth:`request` method of :class:`requests.Session` object.
-
-        :raise PDNSError: If request's response is an error.
+        :param dict data: Data to send, already encoded if bytes
+        :return: Tuple of URL, encoded data (or None) and
+                 request specific headers (or None)
         """
-        if self._api_key:
-            self.request_headers['X-API-Key'] = self._api_key
-
         logger.debug("request: original path is %s", path)
-        if not path.startswith('http://') and not path.startswith('https://'):
-            if path.startswith('/'):
-                path = path.lstrip('/')
-            url = f"{self._api_endpoint}/{path}"
-        else:
+        if path.startswith(('http://', 'https://')):
             url = path
+        else:
+            url = self._base_url + path.lstrip('/')
 
-        if data is None:
-            data = {}
-        data = json.dumps(data)
+        if data is not None:
+            if not isinstance(data, bytes):
+                data = json_dumps(data)
+            headers = _JSON_HEADERS
+        elif method in _BODYLESS_METHODS:
+            headers = None
+        else:
+            data = _EMPTY_BODY
+            headers = _JSON_HEADERS
 
         logger.info("request: %s %s", method, url)
-        logger.debug("headers: %s", self.request_headers)
-        logger.debug("data: %s", data)
-        response = requests.request(method, url,
-                                    data=data,
-                                    headers=self.request_headers,
-                                    timeout=self._timeout,
-                                    verify=self._verify,
-                                    **kwargs)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("headers: %s", self.request_headers)
+            logger.debug("data: %s", data)
+        return url, data, headers
+
+    def _handle_response(self, response, adapter=None):
+        """Handle API response
 
+        :param response: HTTP response, from :mod:`requests` or :mod:`httpx`
+        :param adapter: Pydantic TypeAdapter to validate the json response with
+        :return: Parsed json response as :class:`dict`, or as validated by adapter
+        :raise PDNSError: If response is an error.
+        """
         logger.info("request response code: %d", response.status_code)
-        logger.debug("response: %s", response.text)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("response: %s", response.text)
 
         if response.status_code in [200, 201]:
-            return response.json()
+            if adapter is not None:
+                return adapter.validate_json(response.content)
+            return json_loads(response.content)
         elif response.status_code == 204:
             return ""
         elif response.status_code == 404:
             error_message = 'Not found'
         else:
             try:
-                error_message = self._get_error(response=response.json())
+                error_message = self._get_error(response=json_loads(response.content))
             except Exception:
                 error_message = response.text
 
         logger.error("raising error code %d", response.status_code)
         logger.debug("error response: %s", error_message)
-        raise PDNSError(url=response.url,
+        raise PDNSError(url=str(response.url),
                         status_code=response.status_code,
                         message=error_message)
 
@@ -112,6 +171,21 @@ class PDNSApiClient:
             err = 'No error message found'
         return err
 
+    @abstractmethod
+    def request(self, path, method, data=None, adapter=None, **kwargs):
+        """Handle requests to API"""
+
+    def get_typed(self, path, adapter, **kwargs):
+        """Perform GET request, validating the response with a TypeAdapter
+
+        The raw json response is validated by pydantic-core in a single pass,
+        without being parsed to python objects first.
+
+        :param str path: API endpoint's path to request
+        :param adapter: Pydantic TypeAdapter, built once by the caller
+        """
+        return self.request(path, method='GET', adapter=adapter, **kwargs)
+
     def get(self, path, data=None, **kwargs):
         """Perform GET request"""
         return self.request(path, method='GET', data=data, **kwargs)
@@ -131,3 +205,138 @@ class PDNSApiClient:
     def delete(self, path, data=None, **kwargs):
         """Perform DELETE request"""
         return self.request(path, method='DELETE', data=data, **kwargs)
+
+
+class PDNSApiClient(PDNSApiClientBase):
+    """Powerdns API client
+
+    It implements common HTTP methods GET, POST, PUT, PATCH and DELETE.
+    Requests are issued through a single :class:`requests.Session` so that
+    connections are kept alive and reused between calls. The client can be
+    used as a context manager to release those connections.
+
+    :param str api_endpoint: Powerdns API endpoint
+    :param str api_key: API key
+    :param bool verify: Control SSL certificate validation
+    :param int timeout: Request timeout in seconds
+    :param int pool_maxsize: Maximum number of pooled connections per host
+    """
+    def __init__(self, api_endpoint, api_key, verify=True, timeout=None, pool_maxsize=32):
+        super().__init__(api_endpoint, api_key, verify=verify, timeout=timeout)
+        self._session = requests.Session()
+        self._session.headers.update(self.request_headers)
+        self._session.verify = verify
+        adapter = HTTPAdapter(pool_maxsize=pool_maxsize)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the underlying session and its pooled connections"""
+        self._session.close()
+
+    def request(self, path, method, data=None, adapter=None, **kwargs):
+        """Handle requests to API
+
+        :param str path: API endpoint's path to request
+        :param str method: HTTP method to use
+        :param dict data: Data to send (optional), already encoded if bytes
+        :param adapter: Pydantic TypeAdapter to validate the response with (optional)
+        :return: Parsed json response as :class:`dict`
+
+        Additional named argument may be passed and are directly transmitted
+        to :meth:`request` method of :class:`requests.Session` object.
+
+        :raise PDNSError: If request's response is an error.
+        """
+        url, data, headers = self._prepare_request(path, method, data)
+        response = self._session.request(method, url,
+                                         data=data,
+                                         headers=headers,
+                                         timeout=self._timeout,
+                                         **kwargs)
+        return self._handle_response(response, adapter)
+
+    def download(self, path, fp, chunk_size=65536):
+        """Stream the body of a GET request to a file
+
+        The response body is written chunk by chunk, decompressed but
+        otherwise unchanged, without being loaded in memory.
+
+        :param str path: API endpoint's path to request
+        :param fp: Binary file object to write to
+        :param int chunk_size: Size of chunks read from the response
+        :raise PDNSError: If request's response is an error, or has no content.
+        """
+        url, _, _ = self._prepare_request(path, 'GET', None)
+        with self._session.request('GET', url, timeout=self._timeout, stream=True) as response:
+            if response.status_code != 200:
+                if response.status_code >= 300:
+                    self._handle_response(response)
+                # Any other success would leave an empty file behind
+                raise PDNSError(url=str(response.url),
+                                status_code=response.status_code,
+                                message='No content to download')
+            logger.info("request response code: %d", response.status_code)
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                fp.write(chunk)
+
+
+class PDNSAsyncApiClient(PDNSApiClientBase):
+    """Powerdns API asynchronous client
+
+    It implements the same HTTP methods as :class:`PDNSApiClient`, returning
+    awaitables. Requests are issued through a single
+    :class:`httpx.AsyncClient` with HTTP/2 enabled, so that concurrent
+    requests can be multiplexed over one connection. The client can be used
+    as an asynchronous context manager to release its connections.
+
+    It requires the optional ``httpx`` dependency (``python-powerdns[async]``).
+
+    :param str api_endpoint: Powerdns API endpoint
+    :param str api_key: API key
+    :param bool verify: Control SSL certificate validation
+    :param int timeout: Request timeout in seconds
+    :param bool http2: Enable HTTP/2
+    """
+    def __init__(self, api_endpoint, api_key, verify=True, timeout=None, http2=True):
+        if httpx is None:
+            raise ImportError("PDNSAsyncApiClient requires httpx, install python-powerdns[async]")
+        super().__init__(api_endpoint, api_key, verify=verify, timeout=timeout)
+        self._client = httpx.AsyncClient(headers=self.request_headers,
+                                         verify=verify,
+                                         timeout=timeout,
+                                         http2=http2)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+    async def aclose(self):
+        """Close the underlying client and its connections"""
+        await self._client.aclose()
+
+    async def request(self, path, method, data=None, adapter=None, **kwargs):
+        """Handle requests to API
+
+        :param str path: API endpoint's path to request
+        :param str method: HTTP method to use
+        :param dict data: Data to send (optional), already encoded if bytes
+        :param adapter: Pydantic TypeAdapter to validate the response with (optional)
+        :return: Parsed json response as :class:`dict`
+
+        Additional named argument may be passed and are directly transmitted
+        to :meth:`request` method of :class:`httpx.AsyncClient` object.
+
+        :raise PDNSError: If request's response is an error.
+        """
+        url, data, headers = self._prepare_request(path, method, data)
+        response = await self._client.request(method, url, content=data, headers=headers, **kwargs)
+        return self._handle_response(response, adapter)
@@ -49,3 +49,20 @@ class PDNSError(Exception):
         self.url = url
         self.status_code = status_code
         self.message = message
+
+
+class PDNSChangesError(Exception):
+    """PowerDNS API changes Exception
+
+    Raised when changes failed to be applied to some zones, the changes of
+    other zones being applied anyway.
+    """
+    def __str__(self):
+        return "changes failed for %d zone(s): %s" % (len(self.errors),
+                                                      ", ".join(str(zone) for zone in self.errors))
+
+    def __init__(self, responses, errors):
+        """Initialization"""
+        super(PDNSChangesError, self).__init__()
+        self.responses = responses
+        self.errors = errors
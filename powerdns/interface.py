@@ -1,15 +1,36 @@
+import asyncio
 import logging
 import json
 import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
-from .exceptions import PDNSCanonicalError
-from .models import RRSet
+from .client import json_loads
+from .exceptions import PDNSCanonicalError, PDNSChangesError
+from .models import ZONE_RRSETS_ADAPTER, RRSet
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
 
+def _reversed_labels(name):
+    """Get DNS name labels, from the top-level domain down
+
+    :param str name: DNS name
+    :return: Labels as list
+    """
+    return [label for label in reversed(name.split('.')) if label]
+
+
 class PDNSEndpointBase:
     """Base class for PowerDNS API endpoints"""
+    __slots__ = ('api_client', '_get', '_post', '_patch', '_put', '_delete')
+
     def __init__(self, api_client):
         self.api_client = api_client
         self._get = api_client.get
@@ -21,12 +42,17 @@ class PDNSEndpointBase:
 
 class PDNSEndpoint(PDNSEndpointBase):
     """PowerDNS API Endpoint"""
+    __slots__ = ('_servers', '_repr')
+
     def __init__(self, api_client):
         super().__init__(api_client)
         self._servers = None
+        self._repr = None
 
     def __repr__(self):
-        return f'PDNSEndpoint({repr(self.api_client)})'
+        if self._repr is None:
+            self._repr = f'PDNSEndpoint({repr(self.api_client)})'
+        return self._repr
 
     def __str__(self):
         return str(self.api_client)
@@ -42,7 +68,19 @@ class PDNSEndpoint(PDNSEndpointBase):
             logger.info("Getting available servers from API")
             self._servers = [PDNSServer(self.api_client, data)
                              for data in self._get('/servers')]
-        logger.info(f"{len(self._servers)} server(s) listed")
+        logger.info("%d server(s) listed", len(self._servers))
+        return self._servers
+
+    async def servers_async(self):
+        """List PowerDNS servers, using an asynchronous API client
+
+        Asynchronous twin of :attr:`servers`.
+        """
+        if not self._servers:
+            logger.info("Getting available servers from API")
+            self._servers = [PDNSServer(self.api_client, data)
+                             for data in await self._get('/servers')]
+        logger.info("%d server(s) listed", len(self._servers))
         return self._servers
 
 
@@ -64,6 +102,9 @@ class PDNSServer(PDNSEndpointBase):
           "zones_url": "/api/v1/servers/localhost/zones{/zone}",
         }
     """
+    __slots__ = ('_api_data', 'sid', 'version', 'daemon_type', 'url', '_zones', '_zones_index', '_config',
+                 '_repr')
+
     def __init__(self, api_client, api_data):
         super().__init__(api_client)
         self._api_data = api_data
@@ -72,10 +113,14 @@ class PDNSServer(PDNSEndpointBase):
         self.daemon_type = api_data['daemon_type']
         self.url = f'/servers/{self.sid}'
         self._zones = None
+        self._zones_index = None
         self._config = None
+        self._repr = None
 
     def __repr__(self):
-        return f'PDNSServer({repr(self.api_client)}, {repr(self._api_data)})'
+        if self._repr is None:
+            self._repr = f'PDNSServer({repr(self.api_client)}, {repr(self._api_data)})'
+        return self._repr
 
     def __str__(self):
         return self.sid
@@ -99,9 +144,113 @@ class PDNSServer(PDNSEndpointBase):
             logger.info("Getting available zones from API")
             self._zones = [PDNSZone(self.api_client, self, data)
                            for data in self._get(f'{self.url}/zones')]
-        logger.info(f"{len(self._zones)} zone(s) listed")
+        logger.info("%d zone(s) listed", len(self._zones))
         return self._zones
 
+    async def zones_async(self):
+        """List of DNS zones on a PowerDNS server, using an asynchronous API client
+
+        Asynchronous twin of :attr:`zones`.
+        """
+        if not self._zones:
+            logger.info("Getting available zones from API")
+            self._zones = [PDNSZone(self.api_client, self, data)
+                           for data in await self._get(f'{self.url}/zones')]
+        logger.info("%d zone(s) listed", len(self._zones))
+        return self._zones
+
+    def load_all_zone_details(self):
+        """List DNS zones along with their resource record sets
+
+        All zones are fetched with a single API query and their details are
+        seeded from it, so that accessing :attr:`PDNSZone.details` does not
+        query the API once per zone. Zones returned without ``rrsets`` are
+        still fetched lazily. The zones cache is replaced by the result.
+
+        :return: Zones as list of PDNSZone instances
+        """
+        logger.info("Getting available zones with details from API")
+        zones = []
+        for data in self._get(f'{self.url}/zones?rrsets=true'):
+            zone = PDNSZone(self.api_client, self, data)
+            if 'rrsets' in data:
+                zone._details = data
+            zones.append(zone)
+        self._zones = zones
+        logger.info("%d zone(s) listed", len(self._zones))
+        return self._zones
+
+    def fetch_all_details(self, max_workers=32):
+        """Fetch details of every zone using concurrent API queries
+
+        Zones already holding their details are skipped. Details are fetched
+        from a pool of threads sharing the API client connection pool.
+
+        :param int max_workers: Maximum number of concurrent queries
+        :return: Zones as list of PDNSZone instances
+        """
+        zones = [zone for zone in self.zones if not zone._details]
+        logger.info("Fetching details of %d zone(s)", len(zones))
+        if zones:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                list(executor.map(lambda zone: zone.details, zones))
+        return self.zones
+
+    async def fetch_all_details_async(self):
+        """Fetch details of every zone concurrently, using an asynchronous API client
+
+        Asynchronous twin of :meth:`fetch_all_details`.
+
+        :return: Zones as list of PDNSZone instances
+        """
+        zones = [zone for zone in await self.zones_async() if not zone._details]
+        logger.info("Fetching details of %d zone(s)", len(zones))
+        await asyncio.gather(*(zone.details_async() for zone in zones))
+        return self._zones
+
+    def apply_changes(self, changes, batch_size=None, max_workers=8):
+        """Apply resource record sets changes to several zones
+
+        PowerDNS API has no multi-zone query, so each zone is patched on its
+        own. Zones are patched concurrently, each one in a single atomic query
+        by default. When ``batch_size`` is given, the changes of a zone are
+        sent sequentially, in batches of at most ``batch_size`` RRSets,
+        preserving their order. A zone may then be left partially updated if
+        one of its batches fails.
+
+        :param dict changes: Lists of RRSets (REPLACE or DELETE) by PDNSZone
+        :param int batch_size: Maximum number of RRSets per query
+        :param int max_workers: Maximum number of zones patched concurrently
+        :return: Lists of query responses by PDNSZone
+        :raise PDNSChangesError: If changes failed for some zones, along with
+            the responses of the queries which succeeded
+        """
+        logger.info("Applying changes to %d zone(s)", len(changes))
+
+        def patch_zone(zone, rrsets):
+            step = batch_size or max(len(rrsets), 1)
+            responses = []
+            try:
+                for index in range(0, len(rrsets), step):
+                    responses.append(zone._patch_rrsets(rrsets[index:index + step]))
+            except Exception as err:
+                return responses, err
+            return responses, None
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {zone: executor.submit(patch_zone, zone, rrsets) for zone, rrsets in changes.items()}
+
+        responses = {}
+        errors = {}
+        for zone, future in futures.items():
+            responses[zone], error = future.result()
+            if error is not None:
+                logger.error("Failed to apply changes to %s: %s", zone, error)
+                errors[zone] = error
+        if errors:
+            raise PDNSChangesError(responses, errors)
+        return responses
+
     def search(self, search_term, max_result=100):
         """Search term using API search endpoint
 
@@ -109,9 +258,9 @@ class PDNSServer(PDNSEndpointBase):
         :param int max_result: Maximum number of results to return
         :return: Query results as list
         """
-        logger.info(f"API search terms: {search_term}")
+        logger.info("API search terms: %s", search_term)
         results = self._get(f'{self.url}/search-data?q={search_term}&max={max_result}')
-        logger.info(f"{len(results)} search result(s)")
+        logger.info("%d search result(s)", len(results))
         return results
 
     def get_zone(self, name):
@@ -120,8 +269,9 @@ class PDNSServer(PDNSEndpointBase):
         :param str name: Zone name (canonical)
         :return: Zone as PDNSZone instance or None
         """
-        logger.info(f"Getting zone: {name}")
-        return next((zone for zone in self.zones if zone.name == name), None)
+        logger.info("Getting zone: %s", name)
+        zones_by_name, _ = self._get_zones_index()
+        return zones_by_name.get(name)
 
     def suggest_zone(self, r_name):
         """Suggest best matching zone from existing zone
@@ -129,11 +279,39 @@ class PDNSServer(PDNSEndpointBase):
         :param str r_name: Record canonical name
         :return: Zone as PDNSZone object or None
         """
-        logger.info(f"Suggesting zone for: {r_name}")
+        logger.info("Suggesting zone for: %s", r_name)
         if not r_name.endswith('.'):
             raise PDNSCanonicalError(r_name)
-        return max((zone for zone in self.zones if r_name.endswith(zone.name)),
-                   key=lambda z: len(z.name), default=None)
+        _, node = self._get_zones_index()
+        best = node.get(None)
+        for label in _reversed_labels(r_name):
+            node = node.get(label)
+            if node is None:
+                break
+            best = node.get(None, best)
+        return best
+
+    def _get_zones_index(self):
+        """Get zones indexed for lookups
+
+        Indexes are rebuilt whenever the zones cache is replaced. Zones are
+        indexed by name, and in a trie of their reversed labels where each
+        node holds its zone under the ``None`` key.
+
+        :return: Tuple of zones by name and zones trie
+        """
+        zones = self.zones
+        if self._zones_index is None or self._zones_index[0] is not zones:
+            zones_by_name = {}
+            trie = {}
+            for zone in zones:
+                zones_by_name.setdefault(zone.name, zone)
+                node = trie
+                for label in _reversed_labels(zone.name):
+                    node = node.setdefault(label, {})
+                node.setdefault(None, zone)
+            self._zones_index = (zones, zones_by_name, trie)
+        return self._zones_index[1:]
 
     def create_zone(self, name, kind, nameservers, masters=None, servers=None, rrsets=None, update=False):
         """Create or update a (new) zone
@@ -157,16 +335,16 @@ class PDNSServer(PDNSEndpointBase):
         }
 
         if update:
-            logger.info(f"Updating zone: {name}")
+            logger.info("Updating zone: %s", name)
             zone = self.get_zone(name)
             zone_data = self._patch(f"{self.url}/zones/{zone.id}", data=zone_data)
         else:
-            logger.info(f"Creating zone: {name}")
+            logger.info("Creating zone: %s", name)
             zone_data = self._post(f"{self.url}/zones", data=zone_data)
 
         if zone_data:
             self._zones = None
-            logger.info(f"Zone {name} successfully processed")
+            logger.info("Zone %s successfully processed", name)
             return PDNSZone(self.api_client, self, zone_data)
 
     def delete_zone(self, name):
@@ -176,7 +354,7 @@ class PDNSServer(PDNSEndpointBase):
         :return: PDNSApiClient response
         """
         self._zones = None
-        logger.info(f"Deleting zone: {name}")
+        logger.info("Deleting zone: %s", name)
         return self._delete(f"{self.url}/zones/{name}")
 
     def restore_zone(self, json_file):
@@ -185,30 +363,39 @@ class PDNSServer(PDNSEndpointBase):
         :param str json_file: Backup file
         :return: Restored zone as PDNSZone instance or None
         """
-        with open(json_file) as backup_fp:
-            zone_data = json.load(backup_fp)
+        with open(json_file, "rb") as backup_fp:
+            zone_data = json_loads(backup_fp.read())
         self._zones = None
         zone_name = zone_data['name']
         zone_data['nameservers'] = []
-        logger.info(f"Restoring zone: {zone_name}")
+        logger.info("Restoring zone: %s", zone_name)
         zone_data = self._post(f"{self.url}/zones", data=zone_data)
         if zone_data:
-            logger.info(f"Zone successfully restored: {zone_data['name']}")
+            logger.info("Zone successfully restored: %s", zone_data['name'])
             return PDNSZone(self.api_client, self, zone_data)
-        logger.info(f"{zone_name} zone restoration failed")
+        logger.info("%s zone restoration failed", zone_name)
 
 
 class PDNSZone(PDNSEndpointBase):
     """Powerdns API Zone Endpoint"""
+    __slots__ = ('server', 'name', 'url', '_details', '_rrsets_index', '_rrsets', '_repr')
+
     def __init__(self, api_client, server, api_data):
         super().__init__(api_client)
         self.server = server
         self.name = api_data['name']
         self.url = f'{self.server.url}/zones/{self.name}'
         self._details = None
+        self._rrsets_index = None
+        self._rrsets = None
+        self._repr = None
 
     def __repr__(self):
-        return f"PDNSZone({repr(self.api_client)}, {repr(self.server)}, {repr(self._details)})"
+        # Cached along with the details it was built from, these may be large
+        if self._repr is None or self._repr[0] is not self._details:
+            self._repr = (self._details,
+                          f"PDNSZone({repr(self.api_client)}, {repr(self.server)}, {repr(self._details)})")
+        return self._repr[1]
 
     def __str__(self):
         return self.name
@@ -217,23 +404,98 @@ class PDNSZone(PDNSEndpointBase):
     def details(self):
         """Get zone's detailed data"""
         if not self._details:
-            logger.info(f"Getting {self.name} zone details from API")
+            logger.info("Getting %s zone details from API", self.name)
             self._details = self._get(self.url)
         return self._details
 
+    async def details_async(self):
+        """Get zone's detailed data, using an asynchronous API client
+
+        Asynchronous twin of :attr:`details`.
+        """
+        if not self._details:
+            logger.info("Getting %s zone details from API", self.name)
+            self._details = await self._get(self.url)
+        return self._details
+
     @property
     def records(self):
         """Get zone's records"""
         return self.details['rrsets']
 
+    @property
+    def rrsets(self):
+        """Get zone's records as RRSet instances
+
+        RRSets are decoded once from zone details, until these are replaced.
+        """
+        details = self.details
+        if self._rrsets is None or self._rrsets[0] is not details:
+            self._rrsets = (details, list(self.iter_records()))
+        return self._rrsets[1]
+
+    def iter_records(self):
+        """Iterate over zone's records as RRSet instances
+
+        RRSets are decoded one at a time from zone details, so that callers
+        looking for a few of them can stop early without decoding the rest.
+
+        :return: RRSets iterator
+        """
+        return map(RRSet.from_api, self.details['rrsets'])
+
+    def fetch_rrsets(self):
+        """Fetch zone's records from API as RRSet instances
+
+        The API response is validated straight into RRSet instances, without
+        going through zone details, which are left untouched.
+
+        :return: RRSets as list
+        """
+        logger.info("Getting %s zone rrsets from API", self.name)
+        return self.api_client.get_typed(self.url, ZONE_RRSETS_ADAPTER).rrsets
+
     def get_record(self, name):
         """Get record data
 
         :param str name: Record name
         :return: Records data as list
         """
-        logger.info(f"Getting zone record: {name}")
-        return [record for record in self.details['rrsets'] if name == record['name']]
+        logger.info("Getting zone record: %s", name)
+        rrsets_by_name, _ = self._get_rrsets_index()
+        return list(rrsets_by_name.get(name, ()))
+
+    def get_rrset(self, name, rtype):
+        """Get resource record set as RRSet instance
+
+        The RRSet is decoded from zone details on each call, without validation.
+
+        :param str name: Record name
+        :param str rtype: Record type
+        :return: RRSet instance or None
+        """
+        logger.info("Getting zone rrset: %s %s", name, rtype)
+        _, rrsets_by_key = self._get_rrsets_index()
+        rrset = rrsets_by_key.get((name, rtype))
+        return None if rrset is None else RRSet.from_api(rrset)
+
+    def _get_rrsets_index(self):
+        """Get zone's records indexed for lookups
+
+        Indexes are rebuilt whenever zone details are replaced, as done by
+        records creation and deletion.
+
+        :return: Tuple of RRSets lists by name and RRSets by (name, type)
+        """
+        details = self.details
+        if self._rrsets_index is None or self._rrsets_index[0] is not details:
+            rrsets_by_name = {}
+            rrsets_by_key = {}
+            for rrset in details['rrsets']:
+                rrsets_by_name.setdefault(rrset['name'], []).append(rrset)
+                rrsets_by_key[(rrset['name'], rrset['type'])] = rrset
+            self._rrsets_index = (details, rrsets_by_name, rrsets_by_key)
+        return self._rrsets_index[1:]
 
     # TODO This client needs to be rewritten so that we can check that we get a 204 response here
     def create_records(self, rrsets: list[RRSet]):
@@ -242,15 +504,11 @@ class PDNSZone(PDNSEndpointBase):
         :param list rrsets: Resource record sets
         :return: Query response
         """
-        logger.info(f"Creating {len(rrsets)} record(s) in {self.name}")
+        logger.info("Creating %d record(s) in %s", len(rrsets), self.name)
 
-        serialized_data = []
         for rrset in rrsets:
-            rrset.ensure_canonical(self.name)
             assert rrset.changetype == 'REPLACE'
-            serialized_data.append(rrset.model_dump(by_alias=True))
-        self._details = None
-        return self._patch(self.url, data={'rrsets': serialized_data})
+        return self._patch_rrsets(rrsets)
 
     def delete_records(self, rrsets: list[RRSet]):
         """Delete resource record sets
@@ -258,15 +516,22 @@ class PDNSZone(PDNSEndpointBase):
         :param list rrsets: Resource record sets
         :return: Query response
         """
-        logger.info(f"Deleting {len(rrsets)} records from {self.name}")
+        logger.info("Deleting %d records from %s", len(rrsets), self.name)
 
-        serialized_data = []
         for rrset in rrsets:
-            rrset.ensure_canonical(self.name)
             assert rrset.changetype == 'DELETE'
-            serialized_data.append(rrset.model_dump(by_alias=True))
+        return self._patch_rrsets(rrsets)
+
+    def _patch_rrsets(self, rrsets):
+        """Send resource record sets changes in a single query
+
+        :param list rrsets: Resource record sets
+        :return: Query response
+        """
+        for rrset in rrsets:
+            rrset.ensure_canonical(self.name)
         self._details = None
-        return self._patch(self.url, data={'rrsets': serialized_data})
+        return self._patch(self.url, data={'rrsets': rrsets})
 
     def backup(self, directory, filename=None, pretty_json=False):
         """Backup zone data to json file
@@ -274,19 +539,40 @@ class PDNSZone(PDNSEndpointBase):
         :param str directory: Directory to store json file
         :param str filename: Json file name
         :param bool pretty_json: Enable pretty json display
+
+        When zone details are not cached yet and pretty json is disabled, the
+        API response is streamed as is to a temporary file, which replaces the
+        json file once the download is complete. Otherwise, details are
+        encoded with orjson when available, non-ASCII characters being then
+        written as UTF-8 instead of being escaped.
         """
-        logger.info(f"Backing up zone: {self.name}")
+        logger.info("Backing up zone: %s", self.name)
         filename = filename or f"{self.name.rstrip('.')}.json"
         json_file = os.path.join(directory, filename)
-        logger.info(f"Backup file is {json_file}")
-        with open(json_file, "w") as backup_fp:
-            json.dump(self.details, backup_fp,
-                      ensure_ascii=True,
-                      indent=2 if pretty_json else None,
-                      sort_keys=True if pretty_json else False)
-        logger.info(f"Zone {self.name} successfully saved")
+        logger.info("Backup file is %s", json_file)
+        if not self._details and not pretty_json:
+            # An interrupted download must not replace a previous backup
+            backup_fp = tempfile.NamedTemporaryFile(dir=directory, prefix=f".{filename}.", delete=False)
+            try:
+                with backup_fp:
+                    self.api_client.download(self.url, backup_fp)
+                os.replace(backup_fp.name, json_file)
+            except BaseException:
+                os.unlink(backup_fp.name)
+                raise
+        elif orjson is not None:
+            option = orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS if pretty_json else 0
+            Path(json_file).write_bytes(orjson.dumps(self.details, option=option))
+        else:
+            with open(json_file, "w") as backup_fp:
+                json.dump(self.details, backup_fp,
+                          ensure_ascii=True,
+                          indent=2 if pretty_json else None,
+                          separators=None if pretty_json else (',', ':'),
+                          sort_keys=True if pretty_json else False)
+        logger.info("Zone %s successfully saved", self.name)
 
     def notify(self):
         """Trigger notification for zone updates"""
-        logger.info(f"Notifying of zone: {self.name}")
+        logger.info("Notifying of zone: %s", self.name)
         return self._put(f"{self.url}/notify")
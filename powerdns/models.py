@@ -1,7 +1,9 @@
-from pydantic import BaseModel, Field, field_validator
-from typing import Optional
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field, TypeAdapter, field_validator
+from typing import Iterable, Optional
 import time
 
+from ._canonical import canonicalize, clear_canonicalize_cache
+
 
 class Comment(BaseModel):
     """
@@ -10,11 +12,27 @@ class Comment(BaseModel):
     content (string) – The actual comment
     account (string) – Name of an account that added the comment
     modified_at (integer) – Timestamp of the last change to the comment
+
+    Comments are immutable.
     """
-    content: str = Field(..., description='The content of the comment')
-    account: str = Field(default="", description='The account')
-    modified_at: int = Field(default_factory=lambda: int(time.time()),
-                             description='Unix timestamp at which the comment was last modified')
+    model_config = ConfigDict(frozen=True)
+
+    content: str
+    account: str = ""
+    modified_at: int = Field(default_factory=lambda: int(time.time()))
+
+    @classmethod
+    def bulk(cls, contents: Iterable[tuple[str, str]]) -> list["Comment"]:
+        """
+        Build several comments sharing the same modification timestamp.
+
+        The current time is read once for all comments.
+
+        Args:
+            contents (Iterable[tuple[str, str]]): Pairs of comment content and account.
+        """
+        modified_at = int(time.time())
+        return [cls(content=content, account=account, modified_at=modified_at) for content, account in contents]
 
     def __repr__(self):
         return f"Comment({repr(self.content)}, {repr(self.account)}, {repr(self.modified_at)})"
@@ -23,41 +41,104 @@ class Comment(BaseModel):
 class Record(BaseModel):
     """
     The RREntry object represents a single record.
+
+    content (string) – The content of this record
+    disabled (boolean) – Whether or not this record is disabled
+
+    Records are immutable.
     """
-    content: str = Field(..., description='The content of this record')
-    disabled: bool = Field(default=False, description='Whether or not this record is disabled')
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
+    content: str
+    disabled: bool = False
+
+    def __repr__(self):
+        return f"Record({repr(self.content)}, {repr(self.disabled)})"
+
+
+def _record_from_sequence(item):
+    content, disabled = item
+    return Record(content=content, disabled=disabled)
+
+
+# Record builders by exact input type, dispatched once per record
+_RECORD_BUILDERS = {
+    str: lambda content: Record(content=content),
+    dict: lambda data: Record(**data),
+    tuple: _record_from_sequence,
+    list: _record_from_sequence,
+    Record: lambda record: record,
+}
+
+
+def _record_builder_for_subclass(item):
+    # Slow path for subclasses of the supported types, such as OrderedDict
+    for types, build in ((Record, _RECORD_BUILDERS[Record]), (str, _RECORD_BUILDERS[str]),
+                         (dict, _RECORD_BUILDERS[dict]), ((tuple, list), _record_from_sequence)):
+        if isinstance(item, types):
+            return build
+    raise ValueError(f"Invalid record format: {item}")
 
 
 class RRSet(BaseModel):
     name: str = Field(..., description='Record name')
-    rtype: str = Field(..., serialization_alias='type', description='Record type')
+    rtype: str = Field(..., validation_alias=AliasChoices('rtype', 'type'), serialization_alias='type',
+                       description='Record type')
     ttl: int = Field(default=3600, description='Record time to live')
     changetype: str = Field(default='REPLACE', description='API keyword DELETE or REPLACE')
     records: list[Record] = Field(..., description='All records in this RRSet')
     comments: Optional[list[Comment]] = Field(default_factory=list, description='List of comments')
 
+    @classmethod
+    def for_zone(cls, zone: str, **data) -> "RRSet":
+        """
+        Build an RRSet in canonical form for a zone.
+
+        Args:
+            zone (str): Zone name the RRSet belongs to, see :meth:`ensure_canonical`.
+            **data: RRSet fields, validated as by the constructor.
+        """
+        rrset = cls(**data)
+        rrset.ensure_canonical(zone)
+        return rrset
+
+    @classmethod
+    def from_api(cls, data: dict) -> "RRSet":
+        """
+        Build an RRSet from PowerDNS API data, without validation.
+
+        Data returned by the API is trusted to have the expected shape, so validators
+        are skipped entirely. User provided data should go through the constructor.
+
+        Args:
+            data (dict): RRSet data, as returned by the PowerDNS API.
+        """
+        records = [Record.model_construct(content=record['content'], disabled=record.get('disabled', False))
+                   for record in data['records']]
+        comments = [Comment.model_construct(**comment) for comment in data.get('comments') or ()]
+        return cls.model_construct(name=data['name'], rtype=data['type'], ttl=data.get('ttl', 3600),
+                                   changetype=data.get('changetype', 'REPLACE'), records=records,
+                                   comments=comments)
+
     @field_validator('records', mode='before')
     @classmethod
     def validate_records(cls, v):
-        if isinstance(v, list):
-            records = []
-            for item in v:
-                if isinstance(item, str):
-                    records.append(Record(content=item))
-                elif isinstance(item, dict):
-                    records.append(Record(**item))
-                elif isinstance(item, Record):
-                    records.append(item)
-            return records
-        elif isinstance(v, str):
+        if isinstance(v, str):
             return [Record(content=v)]
-        raise ValueError(f"Invalid records format: {v}")
+        if not isinstance(v, list):
+            raise ValueError(f"Invalid records format: {v}")
+        records = []
+        for item in v:
+            build = _RECORD_BUILDERS.get(type(item)) or _record_builder_for_subclass(item)
+            records.append(build(item))
+        return records
 
     def __repr__(self):
         return f"RRSet(name={repr(self.name)}, type={repr(self.rtype)}, records={repr(self.records)}, ttl={self.ttl}, changetype={repr(self.changetype)}, comments={repr(self.comments)})"
 
     def __str__(self):
-        return f"(ttl={self.ttl}) {self.name}  {self.rtype}  {self.records} {self.comments}"
+        contents = [record.content for record in self.records]
+        return f"(ttl={self.ttl}) {self.name}  {self.rtype}  {contents} {self.comments}"
 
     def ensure_canonical(self, zone: str):
         """
@@ -75,12 +156,25 @@ class RRSet(BaseModel):
         Note:
             This method modifies the RRSet in-place. The changes cannot be reverted.
         """
-        if not zone.endswith('.'):
+        if zone[-1:] != '.':
             raise ValueError(f"Zone {zone} is not canonical.")
-        if not self.name.endswith('.'):
-            self.name += f".{zone}"
+        self.name = canonicalize(self.name, zone)
         if self.rtype == 'CNAME':
-            for record in self.records:
-                if not record.content.endswith('.'):
-                    record.content += f".{zone}"
+            records = self.records
+            for index, record in enumerate(records):
+                content = record.content
+                if content[-1:] != '.':
+                    records[index] = Record.model_construct(content=canonicalize(content, zone),
+                                                            disabled=record.disabled)
+
+
+class ZoneRRSets(BaseModel):
+    """
+    The resource record sets of a zone, as returned by the PowerDNS API along with
+    the other zone attributes, which are ignored.
+    """
+    rrsets: list[RRSet]
+
 
+# Built once, validate API RRSets in a single pydantic-core call
+ZONE_RRSETS_ADAPTER = TypeAdapter(ZoneRRSets)
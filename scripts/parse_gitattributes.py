@@ -1,28 +1,31 @@
 #!/usr/bin/env python3
 
-import os
 import shutil
+import stat
+from pathlib import Path
 
 
 def process_gitattributes():
-    if not os.path.exists('.gitattributes'):
+    gitattributes = Path('.gitattributes')
+    if not gitattributes.exists():
         # This was before we added the file to the repo
         return
 
-    with open('.gitattributes', 'r') as f:
-        for line in f:
-            line = line.strip()
-            if 'export-ignore' in line:
-                file_to_remove = line.split()[0]
-                print(f"DEBUG: Attempting to remove: {file_to_remove}")
-                if os.path.exists(file_to_remove):
-                    if os.path.isdir(file_to_remove):
-                        shutil.rmtree(file_to_remove)
-                    else:
-                        os.remove(file_to_remove)
-                        print(f"DEBUG: Removed {file_to_remove}")
-                else:
-                    print(f"DEBUG: File not found: {file_to_remove}")
+    files_to_remove = [line.split(None, 1)[0] for line in gitattributes.read_text().splitlines()
+                       if 'export-ignore' in line]
+    for file_to_remove in files_to_remove:
+        print(f"DEBUG: Attempting to remove: {file_to_remove}")
+        path = Path(file_to_remove)
+        try:
+            mode = path.lstat().st_mode
+        except FileNotFoundError:
+            print(f"DEBUG: File not found: {file_to_remove}")
+            continue
+        if stat.S_ISDIR(mode):
+            shutil.rmtree(path)
+        else:
+            path.unlink()
+            print(f"DEBUG: Removed {file_to_remove}")
 
 
 if __name__ == "__main__":
@@ -1,8 +1,13 @@
-from unittest import TestCase
-from unittest.mock import patch, Mock
+from importlib.util import find_spec
+from io import BytesIO
+from unittest import IsolatedAsyncioTestCase, TestCase, skipIf
+from unittest.mock import AsyncMock, MagicMock, patch, Mock
+import requests
 from powerdns.exceptions import PDNSError
 
-from powerdns.client import PDNSApiClient
+from powerdns import client as powerdns_client
+from powerdns.client import PDNSApiClient, PDNSApiClientBase, PDNSAsyncApiClient, json_dumps, json_loads
+from powerdns.models import ZONE_RRSETS_ADAPTER, RRSet
 
 
 class TestClient(TestCase):
@@ -12,43 +17,239 @@ class TestClient(TestCase):
         self.api_key = "test_key"
         self.client = PDNSApiClient(self.api_endpoint, self.api_key, verify=False)
 
+    def test_client_base_is_abstract(self):
+        with self.assertRaises(TypeError):
+            PDNSApiClientBase(self.api_endpoint, self.api_key)
+
     def test_client_repr_and_str(self):
         repr_str = f"PDNSApiClient('{self.api_endpoint}', '{self.api_key}', verify=False, timeout=None)"
         self.assertEqual(repr(self.client), repr_str)
         self.assertEqual(str(self.client), self.api_endpoint)
 
-    @patch('powerdns.client.requests.request')
-    def test_client_full_uri(self, mock_request):
+    def test_client_session(self):
+        self.assertEqual(self.client._session.headers['X-API-Key'], self.api_key)
+        self.assertNotIn('Content-Type', self.client._session.headers)
+        self.assertFalse(self.client._session.verify)
+
+    def test_client_download_interrupted(self):
+        def iter_content(chunk_size):
+            yield b'{"name": '
+            raise requests.exceptions.ChunkedEncodingError("Connection broken")
+
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.__enter__.return_value = mock_response
+        mock_response.iter_content.side_effect = iter_content
+        fp = BytesIO()
+
+        with patch.object(self.client._session, 'request', return_value=mock_response):
+            with self.assertRaises(requests.exceptions.ChunkedEncodingError):
+                self.client.download("/servers/localhost/zones/example.com.", fp)
+
+        self.assertEqual(fp.getvalue(), b'{"name": ')
+        mock_response.__exit__.assert_called_once()
+
+    def test_client_download(self):
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.__enter__.return_value = mock_response
+        mock_response.iter_content.return_value = [b'{"name": ', b'"example.com."}']
+        fp = BytesIO()
+
+        with patch.object(self.client._session, 'request', return_value=mock_response) as mock_request:
+            self.client.download("/servers/localhost/zones/example.com.", fp)
+
+        self.assertEqual(fp.getvalue(), b'{"name": "example.com."}')
+        self.assertTrue(mock_request.call_args[1]['stream'])
+
+    def test_client_download_error(self):
+        mock_response = MagicMock()
+        mock_response.status_code = 404
+        mock_response.__enter__.return_value = mock_response
+        mock_response.url = self.api_endpoint + "/servers/localhost/zones/example.com."
+
+        with patch.object(self.client._session, 'request', return_value=mock_response):
+            with self.assertRaises(PDNSError):
+                self.client.download("/servers/localhost/zones/example.com.", BytesIO())
+
+    def test_client_download_no_content(self):
+        mock_response = MagicMock()
+        mock_response.status_code = 204
+        mock_response.__enter__.return_value = mock_response
+        mock_response.url = self.api_endpoint + "/servers/localhost/zones/example.com."
+        fp = BytesIO()
+
+        with patch.object(self.client._session, 'request', return_value=mock_response):
+            with self.assertRaises(PDNSError) as context:
+                self.client.download("/servers/localhost/zones/example.com.", fp)
+
+        self.assertEqual(context.exception.status_code, 204)
+        mock_response.iter_content.assert_not_called()
+
+    def test_client_context_manager(self):
+        with patch.object(self.client._session, 'close') as mock_close:
+            with self.client as client:
+                self.assertIs(client, self.client)
+            mock_close.assert_called_once_with()
+
+    def test_client_full_uri(self):
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = [{'id': 'localhost'}]
-        mock_request.return_value = mock_response
+        mock_response.content = b'[{"id": "localhost"}]'
 
-        result = self.client.get(self.api_endpoint + "/servers")
+        with patch.object(self.client._session, 'request', return_value=mock_response) as mock_request:
+            result = self.client.get(self.api_endpoint + "/servers")
 
         self.assertIsInstance(result, list)
         self.assertEqual(result, [{'id': 'localhost'}])
         mock_request.assert_called_once_with(
             'GET',
             self.api_endpoint + "/servers",
-            data='{}',
-            headers=self.client.request_headers,
-            timeout=None,
-            verify=False
+            data=None,
+            headers=None,
+            timeout=None
+        )
+
+    def test_client_get_typed(self):
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.content = (b'{"name": "example.com.", "kind": "Native", "rrsets": [{"name": "www.example.com.", '
+                                 b'"type": "A", "ttl": 300, '
+                                 b'"records": [{"content": "192.0.2.1", "disabled": false}]}]}')
+
+        with patch.object(self.client._session, 'request', return_value=mock_response):
+            result = self.client.get_typed("/servers/localhost/zones/example.com.", ZONE_RRSETS_ADAPTER)
+
+        self.assertEqual(result.rrsets, [RRSet(name="www.example.com.", rtype="A", ttl=300, records=["192.0.2.1"])])
+
+    def test_client_json_body(self):
+        mock_response = Mock()
+        mock_response.status_code = 204
+
+        with patch.object(self.client._session, 'request', return_value=mock_response) as mock_request:
+            self.client.post("/servers/localhost/zones", data={'name': 'example.com.'})
+
+        mock_request.assert_called_once()
+        self.assertEqual(json_loads(mock_request.call_args[1]['data']), {'name': 'example.com.'})
+        self.assertEqual(mock_request.call_args[1]['headers'], {'Content-Type': 'application/json'})
+
+    def test_client_empty_body(self):
+        mock_response = Mock()
+        mock_response.status_code = 204
+
+        with patch.object(self.client._session, 'request', return_value=mock_response) as mock_request:
+            self.client.put("/servers/localhost/zones/example.com./notify")
+
+        mock_request.assert_called_once_with(
+            'PUT',
+            self.api_endpoint + "/servers/localhost/zones/example.com./notify",
+            data=b'{}',
+            headers={'Content-Type': 'application/json'},
+            timeout=None
         )
 
-    @patch('powerdns.client.requests.request')
-    def test_client_error_handling(self, mock_request):
+    def test_client_error_handling(self):
         # Mock an error response
         mock_response = Mock()
         mock_response.status_code = 404
-        mock_response.json.return_value = {'error': 'Not found'}
+        mock_response.content = b'{"error": "Not found"}'
         mock_response.text = 'Not found'
         mock_response.url = self.api_endpoint + "/nonexistent"
-        mock_request.return_value = mock_response
 
-        with self.assertRaises(PDNSError) as context:
-            self.client.get(self.api_endpoint + "/nonexistent")
+        with patch.object(self.client._session, 'request', return_value=mock_response):
+            with self.assertRaises(PDNSError) as context:
+                self.client.get(self.api_endpoint + "/nonexistent")
 
         self.assertEqual(context.exception.status_code, 404)
         self.assertEqual(context.exception.message, 'Not found')
+
+    def test_client_relative_path(self):
+        mock_response = Mock()
+        mock_response.status_code = 204
+        client = PDNSApiClient(self.api_endpoint + "/", self.api_key)
+
+        with patch.object(client._session, 'request', return_value=mock_response) as mock_request:
+            client.get("/servers")
+            client.get("servers")
+
+        self.assertEqual(mock_request.call_args_list[0][0][1], self.api_endpoint + "/servers")
+        self.assertEqual(mock_request.call_args_list[1][0][1], self.api_endpoint + "/servers")
+
+    @patch('powerdns.client.httpx', None)
+    def test_async_client_without_httpx(self):
+        with self.assertRaises(ImportError):
+            PDNSAsyncApiClient(self.api_endpoint, self.api_key)
+
+    def test_client_encoded_data(self):
+        mock_response = Mock()
+        mock_response.status_code = 204
+
+        with patch.object(self.client._session, 'request', return_value=mock_response) as mock_request:
+            self.client.patch("/servers/localhost/zones/example.com.", data=b'{"rrsets": []}')
+
+        self.assertEqual(mock_request.call_args[1]['data'], b'{"rrsets": []}')
+
+
+@skipIf(powerdns_client.httpx is None or find_spec("h2") is None, "httpx[http2] is not installed")
+class TestAsyncClient(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.api_endpoint = "https://example.com/api/v1"
+        self.api_key = "test_key"
+        self.client = PDNSAsyncApiClient(self.api_endpoint, self.api_key)
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+
+    def test_client_repr(self):
+        repr_str = f"PDNSAsyncApiClient('{self.api_endpoint}', '{self.api_key}', verify=True, timeout=None)"
+        self.assertEqual(repr(self.client), repr_str)
+
+    async def test_client_full_uri(self):
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.content = b'[{"id": "localhost"}]'
+
+        with patch.object(self.client._client, 'request', new=AsyncMock(return_value=mock_response)) as mock_request:
+            result = await self.client.get("/servers")
+
+        self.assertEqual(result, [{'id': 'localhost'}])
+        mock_request.assert_awaited_once_with('GET', self.api_endpoint + "/servers", content=None, headers=None)
+
+    async def test_client_error_handling(self):
+        mock_response = Mock()
+        mock_response.status_code = 422
+        mock_response.content = b'{"error": "Invalid data"}'
+        mock_response.url = self.api_endpoint + "/servers"
+
+        with patch.object(self.client._client, 'request', new=AsyncMock(return_value=mock_response)):
+            with self.assertRaises(PDNSError) as context:
+                await self.client.get("/servers")
+
+        self.assertEqual(context.exception.status_code, 422)
+        self.assertEqual(context.exception.message, 'Invalid data')
+
+
+class TestJson(TestCase):
+
+    @skipIf(powerdns_client.orjson is None, "orjson is not installed")
+    def test_json_dumps_models(self):
+        rrset = RRSet(name="www.example.com.", rtype="A", records=["192.0.2.1"])
+        encoded = json_dumps({'rrsets': [rrset]})
+        self.assertEqual(encoded, powerdns_client.orjson.dumps({'rrsets': [rrset.model_dump(by_alias=True)]}))
+        self.assertEqual(json_loads(encoded), {'rrsets': [rrset.model_dump(by_alias=True)]})
+
+    @patch('powerdns.client.orjson', None)
+    def test_json_dumps_models_without_orjson(self):
+        rrset = RRSet(name="www.example.com.", rtype="A", records=["192.0.2.1"])
+        data = json_loads(json_dumps({'rrsets': [rrset]}))
+        self.assertEqual(data, {'rrsets': [rrset.model_dump(by_alias=True)]})
+
+    def test_json_dumps_unsupported_type(self):
+        with self.assertRaises(TypeError):
+            json_dumps({'data': object()})
+
+    @patch('powerdns.client.orjson', None)
+    def test_json_dumps_unsupported_type_without_orjson(self):
+        with self.assertRaises(TypeError):
+            json_dumps({'data': object()})
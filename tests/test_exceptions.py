@@ -38,3 +38,10 @@ class TestExceptions(TestCase):
         self.assertEqual(str(exc), "fake-name.tld")
         self.assertEqual(exc.name, "fake-name.tld")
         self.assertEqual(exc.message, "'fake-name.tld' is not canonical")
+
+    def test_exception_pdns_changes_error(self):
+        error = exceptions.PDNSError("/fake-url", 422, "Unprocessable Entity")
+        exc = exceptions.PDNSChangesError({"example.org.": []}, {"example.org.": error})
+        self.assertEqual(exc.responses, {"example.org.": []})
+        self.assertEqual(exc.errors, {"example.org.": error})
+        self.assertEqual(str(exc), "changes failed for 1 zone(s): example.org.")
@@ -1,10 +1,14 @@
-from unittest import TestCase
-from unittest.mock import MagicMock, patch
-
-from powerdns.client import PDNSApiClient
-from powerdns.models import RRSet, Record
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import IsolatedAsyncioTestCase, TestCase, skipIf
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from powerdns.client import PDNSApiClient, PDNSAsyncApiClient
+from powerdns.models import ZONE_RRSETS_ADAPTER, RRSet, Record
+from powerdns import interface as powerdns_interface
 from powerdns.interface import PDNSEndpoint, PDNSServer, PDNSZone
-from powerdns.exceptions import PDNSCanonicalError
+from powerdns.exceptions import PDNSCanonicalError, PDNSChangesError, PDNSError
 
 
 class TestEndpoint(TestCase):
@@ -72,6 +76,87 @@ class TestServers(TestCase):
         self.assertIsInstance(zones[0], PDNSZone)
         self.mock_client.get.assert_called_once_with('/servers/localhost/zones')
 
+    def test_server_load_all_zone_details(self):
+        mock_zone_data = [
+            {'name': 'example.com.', 'kind': 'Native', 'rrsets': []},
+            {'name': 'example.org.', 'kind': 'Native'},
+        ]
+        self.mock_client.get.return_value = mock_zone_data
+
+        zones = self.server.load_all_zone_details()
+
+        self.mock_client.get.assert_called_once_with('/servers/localhost/zones?rrsets=true')
+        self.assertIs(self.server.zones, zones)
+        self.assertEqual(zones[0].details, mock_zone_data[0])
+        self.assertIsNone(zones[1]._details)
+        self.mock_client.get.assert_called_once()
+
+    def test_server_fetch_all_details(self):
+        self.server._zones = [
+            PDNSZone(self.mock_client, self.server, {'name': 'example.com.'}),
+            PDNSZone(self.mock_client, self.server, {'name': 'example.org.'}),
+        ]
+        self.server._zones[1]._details = {'name': 'example.org.', 'rrsets': []}
+        self.mock_client.get.side_effect = lambda url: {'name': url.rsplit('/', 1)[-1], 'rrsets': []}
+
+        zones = self.server.fetch_all_details(max_workers=2)
+
+        self.mock_client.get.assert_called_once_with('/servers/localhost/zones/example.com.')
+        self.assertEqual(zones[0].details['name'], 'example.com.')
+        self.assertEqual(zones[1].details['name'], 'example.org.')
+
+    def test_server_apply_changes(self):
+        zone_com = PDNSZone(self.mock_client, self.server, {'name': 'example.com.'})
+        zone_org = PDNSZone(self.mock_client, self.server, {'name': 'example.org.'})
+        changes = {
+            zone_com: [RRSet(name=f'host{index}', rtype='A', records=['192.0.2.1']) for index in range(3)],
+            zone_org: [RRSet(name='www', rtype='A', changetype='DELETE', records=[])],
+        }
+        self.mock_client.patch.return_value = ""
+
+        responses = self.server.apply_changes(changes, batch_size=2)
+
+        self.assertEqual(responses, {zone_com: ["", ""], zone_org: [""]})
+        self.assertEqual(self.mock_client.patch.call_count, 3)
+        payloads = {}
+        for call in self.mock_client.patch.call_args_list:
+            payloads.setdefault(call[0][0], []).append([rrset.name for rrset in call[1]['data']['rrsets']])
+        self.assertEqual(payloads[zone_com.url], [['host0.example.com.', 'host1.example.com.'],
+                                                  ['host2.example.com.']])
+        self.assertEqual(payloads[zone_org.url], [['www.example.org.']])
+
+    def test_server_apply_changes_single_query(self):
+        zone = PDNSZone(self.mock_client, self.server, {'name': 'example.com.'})
+        self.mock_client.patch.return_value = ""
+
+        responses = self.server.apply_changes(
+            {zone: [RRSet(name=f'host{index}', rtype='A', records=['192.0.2.1']) for index in range(150)]})
+
+        self.assertEqual(responses, {zone: [""]})
+        self.assertEqual(len(self.mock_client.patch.call_args[1]['data']['rrsets']), 150)
+
+    def test_server_apply_changes_error(self):
+        zone_com = PDNSZone(self.mock_client, self.server, {'name': 'example.com.'})
+        zone_org = PDNSZone(self.mock_client, self.server, {'name': 'example.org.'})
+        error = PDNSError(zone_org.url, 422, "Unprocessable Entity")
+
+        def patch(url, data):
+            if url == zone_org.url:
+                raise error
+            return ""
+
+        self.mock_client.patch.side_effect = patch
+        changes = {
+            zone_com: [RRSet(name='www', rtype='A', records=['192.0.2.1'])],
+            zone_org: [RRSet(name='www', rtype='A', records=['192.0.2.1'])],
+        }
+
+        with self.assertRaises(PDNSChangesError) as context:
+            self.server.apply_changes(changes)
+
+        self.assertEqual(context.exception.responses, {zone_com: [""], zone_org: []})
+        self.assertEqual(context.exception.errors, {zone_org: error})
+
     def test_server_create_zone(self):
         zone_name = "test.example.com."
         mock_zone_data = {'name': zone_name, 'kind': 'Native'}
@@ -102,6 +187,74 @@ class TestServers(TestCase):
         with self.assertRaises(PDNSCanonicalError):
             self.server.suggest_zone("invalid")
 
+    def test_server_suggest_zone_longest_match(self):
+        self.server._zones = [
+            PDNSZone(self.mock_client, self.server, {'name': 'example.com.'}),
+            PDNSZone(self.mock_client, self.server, {'name': 'sub.example.com.'}),
+        ]
+
+        self.assertEqual(self.server.suggest_zone("www.sub.example.com.").name, "sub.example.com.")
+        self.assertEqual(self.server.suggest_zone("www.example.com.").name, "example.com.")
+        self.assertEqual(self.server.suggest_zone("sub.example.com.").name, "sub.example.com.")
+        self.assertIsNone(self.server.suggest_zone("www.badexample.com."))
+        self.assertIsNone(self.server.suggest_zone("example.org."))
+
+    def test_server_zones_index_invalidation(self):
+        self.server._zones = [
+            PDNSZone(self.mock_client, self.server, {'name': 'example.com.'})
+        ]
+        self.assertIsNotNone(self.server.get_zone("example.com."))
+
+        self.server._zones = [
+            PDNSZone(self.mock_client, self.server, {'name': 'example.org.'})
+        ]
+        self.assertIsNone(self.server.get_zone("example.com."))
+        self.assertIsNotNone(self.server.get_zone("example.org."))
+
+
+class TestAsyncInterface(IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.mock_client = MagicMock(spec=PDNSAsyncApiClient)
+        self.mock_client.get = AsyncMock()
+        self.server = PDNSServer(self.mock_client, {
+            'id': 'localhost',
+            'url': '/api/v1/servers/localhost',
+            'daemon_type': 'authoritative',
+            'version': '4.1.0'
+        })
+
+    async def test_endpoint_servers_async(self):
+        self.mock_client.get.return_value = [{'id': 'localhost', 'daemon_type': 'recursor', 'version': 'VERSION'}]
+        api = PDNSEndpoint(self.mock_client)
+
+        servers = await api.servers_async()
+
+        self.assertIsInstance(servers[0], PDNSServer)
+        self.mock_client.get.assert_awaited_once_with('/servers')
+
+    async def test_server_zones_async(self):
+        self.mock_client.get.return_value = [{'name': 'example.com.', 'kind': 'Native'}]
+
+        zones = await self.server.zones_async()
+
+        self.assertIsInstance(zones[0], PDNSZone)
+        self.assertIs(self.server.zones, zones)
+        self.mock_client.get.assert_awaited_once_with('/servers/localhost/zones')
+
+    async def test_server_fetch_all_details_async(self):
+        self.server._zones = [
+            PDNSZone(self.mock_client, self.server, {'name': 'example.com.'}),
+            PDNSZone(self.mock_client, self.server, {'name': 'example.org.'}),
+        ]
+        self.mock_client.get.side_effect = lambda url: {'name': url.rsplit('/', 1)[-1], 'rrsets': []}
+
+        zones = await self.server.fetch_all_details_async()
+
+        self.assertEqual(self.mock_client.get.await_count, 2)
+        self.assertEqual(zones[0].details['name'], 'example.com.')
+        self.assertEqual(zones[1].details['name'], 'example.org.')
+
 
 class TestPDNSZone(TestCase):
 
@@ -127,22 +280,72 @@ class TestPDNSZone(TestCase):
         self.assertEqual(self.zone.name, 'example.com.')
         self.assertEqual(self.zone.url, '/servers/localhost/zones/example.com.')
 
+    def test_zone_slots(self):
+        self.assertFalse(hasattr(self.zone, '__dict__'))
+        with self.assertRaises(AttributeError):
+            self.zone.unknown_attribute = None
+
     def test_zone_str_and_repr(self):
         self.assertEqual(str(self.zone), 'example.com.')
         self.assertIn('PDNSZone', repr(self.zone))
         self.assertIn('example.com.', str(self.zone))  # Changed from repr to str
 
+    def test_zone_repr_cache(self):
+        self.assertTrue(repr(self.zone).endswith(', None)'))
+        self.zone._details = self.zone_data
+        self.assertTrue(repr(self.zone).endswith(f', {repr(self.zone_data)})'))
+        self.assertIs(repr(self.zone), repr(self.zone))
+        self.zone._details = None
+        self.assertTrue(repr(self.zone).endswith(', None)'))
+
     def test_zone_details(self):
         self.mock_client.get.return_value = self.zone_data
         details = self.zone.details
         self.assertEqual(details, self.zone_data)
         self.mock_client.get.assert_called_once_with(self.zone.url)
 
+    def test_zone_details_cache(self):
+        self.mock_client.get.return_value = self.zone_data
+        self.assertIs(self.zone.details, self.zone.details)
+        self.zone.get_record('www.example.com.')
+        self.mock_client.get.assert_called_once_with(self.zone.url)
+
+        self.zone.delete_records([RRSet(name='www', rtype='A', records=[], changetype='DELETE')])
+        self.zone.details
+        self.assertEqual(self.mock_client.get.call_count, 2)
+
     def test_zone_records(self):
         self.mock_client.get.return_value = self.zone_data
         records = self.zone.records
         self.assertEqual(records, self.zone_data['rrsets'])
 
+    def test_zone_rrsets(self):
+        self.mock_client.get.return_value = self.zone_data
+        rrsets = self.zone.rrsets
+        self.assertEqual(len(rrsets), 1)
+        self.assertIsInstance(rrsets[0], RRSet)
+        self.assertEqual(rrsets[0].rtype, 'A')
+        self.assertEqual(rrsets[0].records, [Record(content='192.0.2.1')])
+        self.assertIs(self.zone.rrsets, rrsets)
+        self.mock_client.get.assert_called_once_with(self.zone.url)
+
+    def test_zone_iter_records(self):
+        self.mock_client.get.return_value = self.zone_data
+        with patch.object(RRSet, 'from_api', wraps=RRSet.from_api) as from_api:
+            records = self.zone.iter_records()
+            from_api.assert_not_called()
+            rrset = next(records)
+        from_api.assert_called_once_with(self.zone_data['rrsets'][0])
+        self.assertEqual(rrset.name, 'www.example.com.')
+        self.assertEqual(list(records), [])
+
+    def test_zone_fetch_rrsets(self):
+        self.mock_client.get_typed.return_value = ZONE_RRSETS_ADAPTER.validate_python(self.zone_data)
+        rrsets = self.zone.fetch_rrsets()
+        self.assertEqual(rrsets[0].name, 'www.example.com.')
+        self.mock_client.get_typed.assert_called_once_with(self.zone.url, ZONE_RRSETS_ADAPTER)
+        self.assertIsNone(self.zone._details)
+
     def test_get_record(self):
         self.mock_client.get.return_value = self.zone_data
         record = self.zone.get_record('www.example.com.')
@@ -150,6 +353,23 @@ class TestPDNSZone(TestCase):
         self.assertEqual(record[0]['name'], 'www.example.com.')
         self.assertEqual(record[0]['type'], 'A')
 
+    def test_get_rrset(self):
+        self.mock_client.get.return_value = self.zone_data
+        rrset = self.zone.get_rrset('www.example.com.', 'A')
+        self.assertIsInstance(rrset, RRSet)
+        self.assertEqual(rrset, RRSet.from_api(self.zone_data['rrsets'][0]))
+        self.assertIsNone(self.zone.get_rrset('www.example.com.', 'AAAA'))
+        self.assertEqual(self.zone.get_record('nonexistent.example.com.'), [])
+        self.mock_client.get.assert_called_once_with(self.zone.url)
+
+    def test_rrsets_index_invalidation(self):
+        self.mock_client.get.return_value = self.zone_data
+        self.assertEqual(len(self.zone.get_record('www.example.com.')), 1)
+
+        self.zone.create_records([RRSet(name='new', rtype='A', records=['192.0.2.2'])])
+        self.mock_client.get.return_value = {'name': 'example.com.', 'rrsets': []}
+        self.assertEqual(self.zone.get_record('www.example.com.'), [])
+
     def test_create_records(self):
         rrsets = [
             RRSet(
@@ -181,14 +401,50 @@ class TestPDNSZone(TestCase):
         self.assertEqual(call_args[0][0], self.zone.url)
         self.assertIn('rrsets', call_args[1]['data'])
 
+    @skipIf(powerdns_interface.orjson is None, "orjson is not installed")
+    def test_backup(self):
+        self.zone._details = self.zone_data
+        with TemporaryDirectory() as directory:
+            self.zone.backup(directory, pretty_json=True)
+            content = (Path(directory) / 'example.com.json').read_bytes()
+        self.assertEqual(json.loads(content), self.zone_data)
+        self.assertEqual(content, json.dumps(self.zone_data, indent=2, sort_keys=True).encode())
+
     @patch('powerdns.interface.os.path.join')
     @patch('powerdns.interface.open')
     @patch('powerdns.interface.json.dump')
-    def test_backup(self, mock_json_dump, mock_open, mock_path_join):
+    @patch('powerdns.interface.orjson', None)
+    def test_backup_without_orjson(self, mock_json_dump, mock_open, mock_path_join):
         mock_path_join.return_value = '/path/to/backup/example.com.json'
+        self.zone._details = self.zone_data
         self.zone.backup('/path/to/backup')
         mock_open.assert_called_once_with('/path/to/backup/example.com.json', 'w')
         mock_json_dump.assert_called_once()
+        self.assertEqual(mock_json_dump.call_args[1]['separators'], (',', ':'))
+
+    def test_backup_streamed(self):
+        self.mock_client.download.side_effect = lambda url, fp: fp.write(b'{"name": "example.com."}')
+        with TemporaryDirectory() as directory:
+            self.zone.backup(directory)
+            self.assertEqual([path.name for path in Path(directory).iterdir()], ['example.com.json'])
+            content = (Path(directory) / 'example.com.json').read_bytes()
+        self.assertEqual(content, b'{"name": "example.com."}')
+        self.assertEqual(self.mock_client.download.call_args[0][0], self.zone.url)
+        self.mock_client.get.assert_not_called()
+
+    def test_backup_streamed_interrupted(self):
+        def download(url, fp):
+            fp.write(b'{"name": "example.com.", "rrsets": [')
+            raise ConnectionError("Connection reset")
+
+        self.mock_client.download.side_effect = download
+        with TemporaryDirectory() as directory:
+            backup_file = Path(directory) / 'example.com.json'
+            backup_file.write_bytes(b'{"name": "example.com.", "rrsets": []}')
+            with self.assertRaises(ConnectionError):
+                self.zone.backup(directory)
+            self.assertEqual(list(Path(directory).iterdir()), [backup_file])
+            self.assertEqual(backup_file.read_bytes(), b'{"name": "example.com.", "rrsets": []}')
 
     def test_notify(self):
         self.zone.notify()
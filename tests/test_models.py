@@ -1,6 +1,10 @@
-import json
 import unittest
-from powerdns.models import Comment, Record, RRSet
+from collections import OrderedDict
+from enum import Enum
+from pydantic import ValidationError
+from powerdns.models import Comment, Record, RRSet, clear_canonicalize_cache
+
+RRSET_STR = "(ttl=3600) example.com  A  ['192.0.2.1', '192.0.2.2'] []"
 
 
 class TestComment(unittest.TestCase):
@@ -10,10 +14,23 @@ class TestComment(unittest.TestCase):
         self.assertEqual(comment.account, "testuser")
         self.assertIsInstance(comment.modified_at, int)
 
+    def test_comment_bulk(self):
+        comments = Comment.bulk([("First comment", "user1"), ("Second comment", "user2")])
+        self.assertEqual([(c.content, c.account) for c in comments],
+                         [("First comment", "user1"), ("Second comment", "user2")])
+        self.assertEqual(comments[0].modified_at, comments[1].modified_at)
+
     def test_comment_repr(self):
         comment = Comment(content="Test comment", account="testuser", modified_at=1625097600)
         self.assertEqual(repr(comment), "Comment('Test comment', 'testuser', 1625097600)")
 
+    def test_comment_frozen(self):
+        comment = Comment(content="Test comment", account="testuser", modified_at=1625097600)
+        with self.assertRaises(ValidationError):
+            comment.content = "Other comment"
+        self.assertEqual(hash(comment), hash(Comment(content="Test comment", account="testuser",
+                                                     modified_at=1625097600)))
+
 
 class TestRecord(unittest.TestCase):
     def test_record_creation(self):
@@ -25,14 +42,23 @@ class TestRecord(unittest.TestCase):
         record = Record(content="192.0.2.1", disabled=True)
         self.assertTrue(record.disabled)
 
+    def test_record_repr(self):
+        record = Record(content="192.0.2.1", disabled=True)
+        self.assertEqual(repr(record), "Record('192.0.2.1', True)")
+
+    def test_record_frozen(self):
+        record = Record(content="192.0.2.1")
+        with self.assertRaises(ValidationError):
+            record.content = "192.0.2.2"
+        self.assertEqual(hash(record), hash(Record(content="192.0.2.1")))
+
 
 class TestRRSet(unittest.TestCase):
-    def setUp(self):
-        self.rrset = RRSet(
-            name="example.com",
-            rtype="A",
-            records=["192.0.2.1", "192.0.2.2"]
-        )
+    @classmethod
+    def setUpClass(cls):
+        # Shared by read-only tests, tests mutating RRSets build their own
+        cls.rrset_kwargs = dict(name="example.com", rtype="A", records=["192.0.2.1", "192.0.2.2"])
+        cls.rrset = RRSet(**cls.rrset_kwargs)
 
     def test_rrset_creation(self):
         self.assertEqual(self.rrset.name, "example.com")
@@ -42,8 +68,7 @@ class TestRRSet(unittest.TestCase):
         self.assertEqual(self.rrset.changetype, "REPLACE")
 
     def test_rrset_str(self):
-        expected = "(ttl=3600) example.com  A  [Record(content='192.0.2.1', disabled=False), Record(content='192.0.2.2', disabled=False)] []"
-        self.assertEqual(str(self.rrset), expected)
+        self.assertEqual(str(self.rrset), RRSET_STR)
 
     def test_validate_records(self):
         rrset = RRSet(
@@ -52,16 +77,45 @@ class TestRRSet(unittest.TestCase):
             records=["192.0.2.1", {"content": "192.0.2.2", "disabled": True}, "192.0.2.3"]
         )
         self.assertEqual(len(rrset.records), 3)
-        self.assertIsInstance(rrset.records[0], Record)
-        self.assertIsInstance(rrset.records[1], Record)
-        self.assertIsInstance(rrset.records[2], Record)
-        self.assertFalse(rrset.records[0].disabled)
-        self.assertTrue(rrset.records[1].disabled)
-        self.assertFalse(rrset.records[2].disabled)
+        for i, disabled in enumerate((False, True, False)):
+            with self.subTest(i=i):
+                self.assertIsInstance(rrset.records[i], Record)
+                self.assertIs(rrset.records[i].disabled, disabled)
+
+    def test_rrset_from_api_data(self):
+        rrset = RRSet.model_validate({
+            "name": "www.example.com.",
+            "type": "A",
+            "ttl": 300,
+            "records": [{"content": "192.0.2.1", "disabled": False}],
+            "comments": [{"content": "web", "account": "admin", "modified_at": 1625097600}]
+        })
+        self.assertEqual(rrset.rtype, "A")
+        self.assertEqual(rrset.records[0].content, "192.0.2.1")
+        self.assertEqual(rrset.comments[0].modified_at, 1625097600)
+
+    def test_rrset_from_api(self):
+        rrset = RRSet.from_api({
+            "name": "www",
+            "type": "CNAME",
+            "ttl": 300,
+            "records": [{"content": "example.com", "disabled": True}],
+            "comments": [{"content": "web", "account": "admin", "modified_at": 1625097600}]
+        })
+        self.assertEqual(rrset.rtype, "CNAME")
+        self.assertEqual(rrset.ttl, 300)
+        self.assertEqual(rrset.changetype, "REPLACE")
+        self.assertEqual(rrset.records, [Record(content="example.com", disabled=True)])
+        self.assertEqual(rrset.comments, [Comment(content="web", account="admin", modified_at=1625097600)])
+        rrset.ensure_canonical("example.org.")
+        self.assertEqual(rrset.name, "www.example.org.")
+        self.assertEqual(rrset.records[0].content, "example.com.example.org.")
 
     def test_ensure_canonical(self):
-        self.rrset.ensure_canonical("example.org.")
-        self.assertEqual(self.rrset.name, "example.com.example.org.")
+        rrset = RRSet(**self.rrset_kwargs)
+        rrset.ensure_canonical("example.org.")
+        self.assertEqual(rrset.name, "example.com.example.org.")
+        self.assertEqual(self.rrset.name, "example.com")
 
         cname_rrset = RRSet(
             name="www",
@@ -72,31 +126,96 @@ class TestRRSet(unittest.TestCase):
         self.assertEqual(cname_rrset.name, "www.example.org.")
         self.assertEqual(cname_rrset.records[0].content, "example.com.example.org.")
 
+    def test_ensure_canonical_idempotent(self):
+        cname_rrset = RRSet(
+            name="www",
+            rtype="CNAME",
+            records=["example.com"]
+        )
+        cname_rrset.ensure_canonical("example.org.")
+        cname_rrset.ensure_canonical("example.org.")
+        self.assertEqual(cname_rrset.name, "www.example.org.")
+        self.assertEqual(cname_rrset.records[0].content, "example.com.example.org.")
+
+    def test_ensure_canonical_after_changes(self):
+        rrset = RRSet.for_zone("example.org.", name="www", rtype="CNAME", records=["a"])
+        rrset.name = "api"
+        rrset.records.append(Record(content="b"))
+        rrset.ensure_canonical("example.org.")
+        self.assertEqual(rrset.name, "api.example.org.")
+        self.assertEqual([record.content for record in rrset.records], ["a.example.org.", "b.example.org."])
+
+    def test_canonical_rrset_equality(self):
+        self.assertEqual(RRSet.for_zone("example.org.", name="www", rtype="A", records=["192.0.2.1"]),
+                         RRSet(name="www.example.org.", rtype="A", records=["192.0.2.1"]))
+
+    def test_rrset_for_zone(self):
+        rrset = RRSet.for_zone("example.org.", name="www", rtype="CNAME", records=["example.com"])
+        self.assertEqual(rrset.name, "www.example.org.")
+        self.assertEqual(rrset.records[0].content, "example.com.example.org.")
+        self.assertNotIn("zone", rrset.model_dump())
+
+    def test_rrset_zone_field_ignored(self):
+        rrset = RRSet.model_validate({"name": "www", "type": "A", "records": ["192.0.2.1"], "zone": "example.org."})
+        self.assertEqual(rrset.name, "www")
+
+    def test_ensure_canonical_shared_names(self):
+        clear_canonicalize_cache()
+        first = RRSet.for_zone("example.org.", name="www", rtype="A", records=["192.0.2.1"])
+        second = RRSet.for_zone("example.org.", name="www", rtype="AAAA", records=["2001:db8::1"])
+        self.assertEqual(first.name, "www.example.org.")
+        self.assertIs(first.name, second.name)
+
     def test_ensure_canonical_invalid_zone(self):
+        self.assertRaises(ValueError, self.rrset.ensure_canonical, "example.org")
+
+
+class TestRRSetRecords(unittest.TestCase):
+
+    def test_dict_correct(self):
+        rrset = RRSet(name="test", rtype="TXT", records=[{"content": "foo"},
+                                                          {"content": "bar", "disabled": False},
+                                                          {"content": "baz", "disabled": True}])
+
+        self.assertEqual(rrset.records[0], Record(content="foo", disabled=False))
+        self.assertEqual(rrset.records[1], Record(content="bar", disabled=False))
+        self.assertEqual(rrset.records[2], Record(content="baz", disabled=True))
+
+    def test_tuple_records(self):
+        rrset = RRSet(name="test", rtype="A", records=[("192.0.2.1", True), ["192.0.2.2", False], "192.0.2.3"])
+
+        self.assertEqual(rrset.records, [Record(content="192.0.2.1", disabled=True),
+                                         Record(content="192.0.2.2", disabled=False),
+                                         Record(content="192.0.2.3", disabled=False)])
+
+    def test_subclass_records(self):
+        class Content(str, Enum):
+            WWW = "192.0.2.2"
+
+        rrset = RRSet(name="test", rtype="A", records=[OrderedDict(content="192.0.2.1", disabled=True), Content.WWW])
+
+        self.assertEqual(rrset.records, [Record(content="192.0.2.1", disabled=True),
+                                         Record(content="192.0.2.2", disabled=False)])
+
+    def test_invalid_record(self):
         with self.assertRaises(ValueError):
-            self.rrset.ensure_canonical("example.org")
+            RRSet(name="test", rtype="A", records=[42])
 
+    def test_dict_additional_key(self):
+        with self.assertRaises(ValueError):
+            RRSet(name="test", rtype="TXT", records=[{"content": "baz",
+                                                      "disabled": False,
+                                                      "foo": "bar"}])
 
-class TestJsonSerialization(unittest.TestCase):
-    def test_comment_serialization(self):
-        comment = Comment(content="Test comment", account="testuser", modified_at=1625097600)
-        expected = {
-            "content": "Test comment",
-            "account": "testuser",
-            "modified_at": 1625097600
-        }
-        self.assertEqual(json.loads(comment.model_dump_json()), expected)
+    def test_dict_missing_key(self):
+        with self.assertRaises(ValueError):
+            RRSet(name="test", rtype="TXT", records=[{"disabled": False}])
 
-    def test_record_serialization(self):
-        record = Record(content="192.0.2.1", disabled=True)
-        expected = {
-            "content": "192.0.2.1",
-            "disabled": True
-        }
-        self.assertEqual(json.loads(record.model_dump_json()), expected)
 
-    def test_rrset_serialization(self):
-        rrset = RRSet(
+class TestJsonSerialization(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.full_rrset = RRSet(
             name="example.com",
             rtype="A",
             ttl=300,
@@ -110,7 +229,7 @@ class TestJsonSerialization(unittest.TestCase):
                 Comment(content="Second comment", account="user2", modified_at=1625184000)
             ]
         )
-        expected = {
+        cls.full_rrset_expected = {
             "name": "example.com",
             "type": "A",
             "ttl": 300,
@@ -124,30 +243,42 @@ class TestJsonSerialization(unittest.TestCase):
                 {"content": "Second comment", "account": "user2", "modified_at": 1625184000}
             ]
         }
-        self.assertEqual(json.loads(rrset.model_dump_json(by_alias=True)), expected)
+        # Only inspected, never mutated
+        cls.simple_rrset = RRSet(name="example.com", rtype="A", records=["192.0.2.1"])
+        cls.simple_rrset_dump = cls.simple_rrset.model_dump(mode="json", by_alias=True)
+
+    def test_comment_serialization(self):
+        comment = Comment(content="Test comment", account="testuser", modified_at=1625097600)
+        expected = {
+            "content": "Test comment",
+            "account": "testuser",
+            "modified_at": 1625097600
+        }
+        self.assertEqual(comment.model_dump(mode="json"), expected)
+
+    def test_record_serialization(self):
+        record = Record(content="192.0.2.1", disabled=True)
+        expected = {
+            "content": "192.0.2.1",
+            "disabled": True
+        }
+        self.assertEqual(record.model_dump(mode="json"), expected)
+
+    def test_rrset_serialization(self):
+        self.assertDictEqual(self.full_rrset.model_dump(mode="json", by_alias=True), self.full_rrset_expected)
 
     def test_rrset_serialization_without_comments(self):
-        rrset = RRSet(
-            name="example.com",
-            rtype="A",
-            records=["192.0.2.1", "192.0.2.2"]
-        )
-        serialized = json.loads(rrset.model_dump_json(by_alias=True))
-        self.assertIn("name", serialized)
-        self.assertIn("type", serialized)
-        self.assertIn("records", serialized)
-        self.assertIn("ttl", serialized)
-        self.assertIn("changetype", serialized)
-        self.assertIn("comments", serialized)
+        serialized = self.simple_rrset_dump
+        required = {"name", "type", "records", "ttl", "changetype", "comments"}
+        self.assertGreaterEqual(serialized.keys(), required)
         self.assertEqual(serialized["comments"], [])
 
     def test_rrset_serialization_alias_fields(self):
-        rrset = RRSet(
-            name="example.com",
-            rtype="A",
-            records=["192.0.2.1"]
-        )
-        serialized = json.loads(rrset.model_dump_json(by_alias=True))
+        serialized = self.simple_rrset_dump
         self.assertIn("type", serialized)
         self.assertNotIn("rtype", serialized)
         self.assertEqual(serialized["type"], "A")
+
+
+if __name__ == "__main__":
+    unittest.main(buffer=True, verbosity=1)